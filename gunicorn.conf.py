@@ -0,0 +1,15 @@
+"""
+Gunicorn configuration, picked up automatically by `gunicorn server:app`.
+
+Worker processes are forked after the app (and its track arrays) are loaded, so the
+read-only dataset is shared copy-on-write; each worker serves requests on a small
+thread pool.
+"""
+
+import multiprocessing
+
+bind = '127.0.0.1:3001'
+workers = multiprocessing.cpu_count()
+worker_class = 'gthread'
+threads = 4
+preload_app = True
@@ -1,28 +1,45 @@
 from flask import Flask, send_from_directory, jsonify, request, session
+import functools
+import hashlib
 import logging
-from datetime import datetime
-from src.dataset import genre_groups
-from src.session import Session, get_all_sessions, delete_session
+import os
+from datetime import datetime, timezone
+from src.dataset import Dataset, genre_groups
+from src.session import (Session, get_all_sessions, get_all_sessions_with_info, get_session_owner, delete_session,
+                         add_liked_track, get_liked_track_ids)
 from src.auth import register_user, authenticate_user, get_user_by_id, AuthError
 from src.filters import FILTER_REGISTRY
 from utils.db import init_db, get_db
+from utils.json_provider import ORJSONProvider
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging is configured (level from LOG_LEVEL) when src.dataset is imported above
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='public')
 app.secret_key = 'music-recommendation-system-key'  # Enable sessions
+app.json = ORJSONProvider(app)  # Encode responses with orjson
+
+# Browser cache lifetime for static assets and static API responses; HTML pages are always revalidated
+STATIC_MAX_AGE = 3600
+
+# Initialize at import so WSGI servers (gunicorn server:app) get a ready app, not just `python server.py`
+logger.info("Initializing database...")
+init_db('music_app.db')
+
+# Load the shared track arrays up front; with gunicorn --preload they are built once
+# in the master and shared copy-on-write by every worker. Track lookups need no session
+# state, so this instance serves them directly
+track_dataset = Dataset()
 
 def get_current_session(session_id=None):
     """Get or create the current session for the current user (no global state)"""
+    user_id = session.get('user_id')
 
     # If a specific session_id is requested, load that session
     if session_id is not None:
         try:
             requested_session = Session(session_id)
             # Verify user access if they are logged in
-            user_id = session.get('user_id')
             if user_id and requested_session.user_id and requested_session.user_id != user_id:
                 logger.warning(f"User {user_id} denied access to session {session_id} (owner: {requested_session.user_id})")
                 return None
@@ -38,20 +55,17 @@ def get_current_session(session_id=None):
         try:
             user_session = Session(stored_session_id)
             # Verify ownership
-            user_id = session.get('user_id')
             if user_id and user_session.user_id and user_session.user_id != user_id:
                 logger.warning(f"Session ownership mismatch for user {user_id}, clearing session")
                 session.pop('active_session_id', None)
             else:
-                logger.debug(f"Using active session {stored_session_id}: {user_session.name}")
+                logger.debug("Using active session %s: %s", stored_session_id, user_session.name)
                 return user_session
         except Exception as e:
             logger.warning(f"Failed to load active session {stored_session_id}: {e}")
             session.pop('active_session_id', None)
 
     # No active session found, create or find one for this user
-    user_id = session.get('user_id')
-
     if user_id:
         # For logged-in users, try to get their most recent session
         user_sessions = get_all_sessions(user_id)
@@ -73,46 +87,101 @@ def get_current_session(session_id=None):
         logger.info("Created temporary anonymous session")
         return anonymous_session
 
+def require_user(view):
+    """Require the logged-in user to match the user_id in the URL (401 if logged out, 403 otherwise)"""
+    @functools.wraps(view)
+    def wrapper(user_id, *args, **kwargs):
+        current_user_id = session.get('user_id')
+        if not current_user_id:
+            logger.warning(f"API: Unauthenticated user calling {request.endpoint}")
+            return jsonify({'error': 'Authentication required'}), 401
+
+        if current_user_id != user_id:
+            logger.warning(f"API: User {current_user_id} calling {request.endpoint} for user {user_id}")
+            return jsonify({'error': 'Access denied'}), 403
+
+        return view(user_id, *args, **kwargs)
+    return wrapper
+
+def _load_html_page(filename):
+    """Read an HTML page from the static folder with its ETag and modification time"""
+    path = os.path.join(app.static_folder, filename)
+    with open(path, 'rb') as f:
+        body = f.read()
+    return body, hashlib.md5(body).hexdigest(), datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc)
+
+# Page bodies are read once at import instead of opening and stat-ing the file on every navigation
+HTML_PAGES = {filename: _load_html_page(filename) for filename in ('auth.html', 'index.html', 'sessions.html')}
+
+def _serve_html_page(filename):
+    """Serve a preloaded HTML page, answering revalidation requests with 304 Not Modified"""
+    if app.debug:
+        # Pick up edits to the page without restarting the dev server
+        return send_from_directory(app.static_folder, filename)
+    body, etag, last_modified = HTML_PAGES[filename]
+    response = app.response_class(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route('/')
 def serve_index():
-    return send_from_directory(app.static_folder, 'auth.html')
+    return _serve_html_page('auth.html')
 
 @app.route('/genres')
 def serve_genres():
-    return send_from_directory(app.static_folder, 'index.html')
+    return _serve_html_page('index.html')
 
 @app.route('/auth')
 def serve_auth():
-    return send_from_directory(app.static_folder, 'auth.html')
+    return _serve_html_page('auth.html')
 
 @app.route('/sessions')
 def serve_sessions():
-    return send_from_directory(app.static_folder, 'sessions.html')
+    return _serve_html_page('sessions.html')
+
+def _static_json_response(body, etag):
+    """JSON response for a body that never changes while the app runs; revalidation gets a 304"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    return response.make_conditional(request)
+
+# Genre groups are static, so the response body is serialized and encoded once at import
+GENRES_JSON = app.json.dumps(list(genre_groups.keys())).encode('utf-8')
+GENRES_ETAG = hashlib.md5(GENRES_JSON).hexdigest()
 
 @app.route('/api/genres')
 def get_genres():
     logger.info("API: Getting available genres")
-    genres =  list(genre_groups.keys())
-    return jsonify(genres)
+    return _static_json_response(GENRES_JSON, GENRES_ETAG)
+
+@functools.lru_cache(maxsize=4096)
+def _track_json(track_id):
+    """Serialized track details and their ETag for a known track_id"""
+    track = track_dataset.get_track_by_id(track_id)
+    body = app.json.dumps(track).encode('utf-8')
+    return body, hashlib.md5(body).hexdigest()
 
 @app.route('/api/track/<track_id>')
 def get_track_by_id(track_id):
     """Get track details by ID"""
-    logger.debug(f"API: Getting track by ID: {track_id}")
-    session_obj = get_current_session()
-    dataset = session_obj.get_dataset()
-    
-    track = dataset.get_track_by_id(track_id)
-    if track is None:
+    logger.debug("API: Getting track by ID: %s", track_id)
+    # Unknown ids are rejected before the cache so they cannot evict real tracks
+    if track_id not in track_dataset.id_to_row:
         logger.warning(f"API: Track not found: {track_id}")
         return jsonify({'error': 'Track not found'}), 404
-    return jsonify(track)
+
+    # Track data is read-only, so repeat lookups reuse the encoded body
+    return _static_json_response(*_track_json(track_id))
 
 # Authentication Endpoints
 @app.route('/api/register', methods=['POST'])
 def register():
     """Register a new user"""
-    data = request.get_json()
+    data = request.get_json(silent=True, cache=False)
     if not data:
         logger.warning("API: register called without data")
         return jsonify({'error': 'Registration data required'}), 400
@@ -139,7 +208,7 @@ def register():
 @app.route('/api/login', methods=['POST'])
 def login():
     """Authenticate user login"""
-    data = request.get_json()
+    data = request.get_json(silent=True, cache=False)
     if not data:
         logger.warning("API: login called without data")
         return jsonify({'error': 'Login data required'}), 400
@@ -203,7 +272,7 @@ def get_current_user():
 def update_user(user_id):
     """Update user settings"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data:
             return jsonify({'error': 'Request body required'}), 400
 
@@ -245,7 +314,7 @@ def update_user(user_id):
 @app.route('/api/sessions/<int:session_id>', methods=['PUT'])
 def update_session(session_id):
     """Update session name"""
-    data = request.get_json()
+    data = request.get_json(silent=True, cache=False)
     if not data or 'name' not in data:
         logger.warning(f"API: update_session called for {session_id} without name")
         return jsonify({'error': 'Session name is required'}), 400
@@ -277,11 +346,11 @@ def delete_session_endpoint(session_id):
 
     try:
         # Check if user has access to delete this session
-        session_obj = Session(session_id)
+        owner_id = get_session_owner(session_id)
         user_id = session.get('user_id')
 
-        if session_obj.user_id is not None and session_obj.user_id != user_id:
-            logger.warning(f"API: User {user_id} denied delete access to session {session_id} (owner: {session_obj.user_id})")
+        if owner_id is not None and owner_id != user_id:
+            logger.warning(f"API: User {user_id} denied delete access to session {session_id} (owner: {owner_id})")
             return jsonify({'error': 'Access denied to delete this session'}), 403
 
         # Don't allow deleting the current active session
@@ -341,33 +410,14 @@ def delete_session_endpoint(session_id):
 #     })
 
 @app.route('/api/user/<int:user_id>/sessions', methods=['GET'])
+@require_user
 def get_user_sessions(user_id):
     """Get all sessions for a specific user"""
     logger.info(f"API: Getting sessions for user {user_id}")
 
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to access sessions")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to access sessions for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
-
     try:
-        sessions = get_all_sessions(user_id)
-
-        # Enhance session data with metadata
-        enhanced_sessions = []
-        for session_info in sessions:
-            try:
-                session_obj = Session(session_info['id'])
-                enhanced_info = session_obj.get_session_info()
-                enhanced_sessions.append(enhanced_info)
-            except Exception as e:
-                logger.warning(f"Error enhancing session {session_info['id']}: {e}")
-                enhanced_sessions.append(session_info)
+        # Session rows and their like/filter counts in one query
+        enhanced_sessions = get_all_sessions_with_info(user_id)
 
         logger.info(f"API: Returning {len(enhanced_sessions)} sessions for user {user_id}")
         return jsonify({'sessions': enhanced_sessions})
@@ -377,22 +427,13 @@ def get_user_sessions(user_id):
         return jsonify({'error': 'Failed to retrieve sessions'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions', methods=['POST'])
+@require_user
 def create_user_session(user_id):
     """Create a new session for a specific user"""
     logger.info(f"API: Creating new session for user {user_id}")
     
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to create session")
-        return jsonify({'error': 'Authentication required'}), 401
-    
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to create session for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
-    
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data or 'name' not in data or 'genre' not in data:
             logger.warning("API: create_user_session called without required parameters")
             return jsonify({'error': 'Session name and genre are required'}), 400
@@ -409,7 +450,6 @@ def create_user_session(user_id):
             return jsonify({'error': 'Genre is required'}), 400
 
         # Validate genre group
-        from src.dataset import genre_groups
         if genre_group not in genre_groups:
             logger.warning(f"API: Invalid genre group: {genre_group}")
             return jsonify({'error': 'Invalid genre group'}), 400
@@ -417,12 +457,10 @@ def create_user_session(user_id):
         # Create new session
         new_session = Session.create_new(session_name, user_id)
 
-        # Set the genre pool immediately
-        dataset = new_session.get_dataset()
-        if dataset.set_genre_pool(genre_group):
-            # Update session metadata with genre
+        # Set the genre pool immediately; a new session has no genre or filters to reconstruct yet
+        if new_session.dataset.set_genre_pool(genre_group):
+            # Store the genre; this also bumps updated_at, so no separate save_state() write is needed
             new_session.update_session_metadata(genre_group=genre_group)
-            new_session.save_state()
         else:
             # Clean up the session if genre setting failed
             delete_session(new_session.session_id)
@@ -441,19 +479,10 @@ def create_user_session(user_id):
         return jsonify({'error': 'Failed to create session'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/current', methods=['GET'])
+@require_user
 def get_user_current_session(user_id):
     """Get the current active session for a user"""
-    logger.debug(f"API: Getting current session for user {user_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to get current session")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to get current session for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Getting current session for user %s", user_id)
 
     try:
         # Get current session ID from Flask session
@@ -485,22 +514,13 @@ def get_user_current_session(user_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/current', methods=['PUT'])
+@require_user
 def set_user_current_session(user_id):
     """Set the current active session for a user"""
-    logger.debug(f"API: Setting current session for user {user_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to set current session")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to set current session for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Setting current session for user %s", user_id)
 
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data or 'session_id' not in data:
             logger.warning("API: set_current_session called without session_id")
             return jsonify({'error': 'session_id is required'}), 400
@@ -508,15 +528,15 @@ def set_user_current_session(user_id):
         session_id = data['session_id']
 
         # Verify the session exists and belongs to the user
-        try:
-            session_obj = Session(session_id)
-            if session_obj.user_id != user_id:
-                logger.warning(f"API: User {user_id} trying to set session {session_id} that belongs to user {session_obj.user_id}")
-                return jsonify({'error': 'Session access denied'}), 403
-        except Exception as e:
-            logger.warning(f"API: Session {session_id} not found: {e}")
+        owner_id = get_session_owner(session_id)
+        if owner_id is None:
+            logger.warning(f"API: Session {session_id} not found")
             return jsonify({'error': 'Session not found'}), 404
 
+        if owner_id != user_id:
+            logger.warning(f"API: User {user_id} trying to set session {session_id} that belongs to user {owner_id}")
+            return jsonify({'error': 'Session access denied'}), 403
+
         # Set the current session in Flask session
         session['current_session_id'] = session_id
 
@@ -531,20 +551,11 @@ def set_user_current_session(user_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/filters', methods=['POST'])
+@require_user
 def add_session_filter(user_id, session_id):
     """Add a named filter to a specific session"""
     logger.info(f"API: Adding named filter to session {session_id} for user {user_id}")
 
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to add filter to session")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to add filter to session for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
-
     try:
         # Load the session and verify ownership
         session_obj = Session(session_id)
@@ -552,11 +563,9 @@ def add_session_filter(user_id, session_id):
             logger.warning(f"API: User {user_id} trying to add filter to session {session_id} owned by {session_obj.user_id}")
             return jsonify({'error': 'Access denied to this session'}), 403
 
-        data = request.get_json()
-        try:
-            filter_type = data['filter_type']
-            assert filter_type in FILTER_REGISTRY, f"Unknown filter type: {filter_type}"
-        except:
+        data = request.get_json(silent=True, cache=False)
+        filter_type = data.get('filter_type') if isinstance(data, dict) else None
+        if not isinstance(filter_type, str) or filter_type not in FILTER_REGISTRY:
             logger.warning("API: add_session_filter called without filter_type or invalid filter_type value")
             return jsonify({'error': 'filter_type is required'}), 400
 
@@ -578,36 +587,26 @@ def add_session_filter(user_id, session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/filters', methods=['DELETE'])
+@require_user
 def delete_session_filter(user_id, session_id):
     """Delete a specific filter from a session"""
     logger.info(f"API: Deleting filter from session {session_id} for user {user_id}")
 
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to delete filter from session")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to delete filter from session for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
-
     try:
-        data = request.get_json()
-        filter_id = data.get('filter_id')
+        data = request.get_json(silent=True, cache=False)
+        filter_id = data.get('filter_id') if data else None
 
         if not filter_id:
             return jsonify({'error': 'filter_id is required'}), 400
 
-        # Load the session and verify ownership
-        try:
-            session_obj = Session(session_id)
-        except Exception as e:
-            logger.error(f"API: Session {session_id} not found: {e}")
+        # Verify ownership without loading the session
+        owner_id = get_session_owner(session_id)
+        if owner_id is None:
+            logger.warning(f"API: Session {session_id} not found")
             return jsonify({'error': 'Session not found'}), 404
 
-        if session_obj.user_id and session_obj.user_id != user_id:
-            logger.warning(f"API: User {user_id} does not own session {session_id} (owner: {session_obj.user_id})")
+        if owner_id != user_id:
+            logger.warning(f"API: User {user_id} does not own session {session_id} (owner: {owner_id})")
             return jsonify({'error': 'Access denied'}), 403
 
         # Delete the specific filter
@@ -628,30 +627,20 @@ def delete_session_filter(user_id, session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/filters', methods=['GET'])
+@require_user
 def get_session_filters(user_id, session_id):
     """Get all filters for a specific session"""
-    logger.debug(f"API: Getting filters for session {session_id} for user {user_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to get session filters")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to get session filters for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Getting filters for session %s for user %s", session_id, user_id)
 
     try:
-        # Load the session and verify ownership
-        try:
-            session_obj = Session(session_id)
-        except Exception as e:
-            logger.error(f"API: Session {session_id} not found: {e}")
+        # Verify ownership without loading the session
+        owner_id = get_session_owner(session_id)
+        if owner_id is None:
+            logger.warning(f"API: Session {session_id} not found")
             return jsonify({'error': 'Session not found'}), 404
 
-        if session_obj.user_id and session_obj.user_id != user_id:
-            logger.warning(f"API: User {user_id} does not own session {session_id} (owner: {session_obj.user_id})")
+        if owner_id != user_id:
+            logger.warning(f"API: User {user_id} does not own session {session_id} (owner: {owner_id})")
             return jsonify({'error': 'Access denied'}), 403
 
         # Get all filters for this session
@@ -671,35 +660,24 @@ def get_session_filters(user_id, session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/likes', methods=['GET'])
+@require_user
 def get_session_likes(user_id, session_id):
     """Get all liked tracks for a specific session"""
-    logger.debug(f"API: Getting liked tracks for session {session_id} for user {user_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to get session likes")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to get session likes for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Getting liked tracks for session %s for user %s", session_id, user_id)
 
     try:
-        # Load the session and verify ownership
-        try:
-            session_obj = Session(session_id)
-        except Exception as e:
-            logger.warning(f"API: Session {session_id} not found: {e}")
+        # Verify ownership without loading the session
+        owner_id = get_session_owner(session_id)
+        if owner_id is None:
+            logger.warning(f"API: Session {session_id} not found")
             return jsonify({'error': 'Session not found'}), 404
 
-        # Verify session ownership
-        if session_obj.user_id != user_id:
-            logger.warning(f"API: User {user_id} trying to get likes from session {session_id} owned by {session_obj.user_id}")
+        if owner_id != user_id:
+            logger.warning(f"API: User {user_id} trying to get likes from session {session_id} owned by {owner_id}")
             return jsonify({'error': 'Session access denied'}), 403
 
         # Get liked track IDs
-        liked_track_ids = session_obj.get_liked_track_ids()
+        liked_track_ids = get_liked_track_ids(session_id)
 
         logger.info(f"API: Returning {len(liked_track_ids)} liked tracks for session {session_id}")
         return jsonify({
@@ -712,34 +690,23 @@ def get_session_likes(user_id, session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/likes', methods=['POST'])
+@require_user
 def add_session_like(user_id, session_id):
     """Add a track to liked tracks for a specific session"""
-    logger.debug(f"API: Adding like to session {session_id} for user {user_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to add session like")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to add session like for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Adding like to session %s for user %s", session_id, user_id)
 
     try:
-        # Load the session and verify ownership
-        try:
-            session_obj = Session(session_id)
-        except Exception as e:
-            logger.warning(f"API: Session {session_id} not found: {e}")
+        # Verify ownership without loading the session
+        owner_id = get_session_owner(session_id)
+        if owner_id is None:
+            logger.warning(f"API: Session {session_id} not found")
             return jsonify({'error': 'Session not found'}), 404
 
-        # Verify session ownership
-        if session_obj.user_id != user_id:
-            logger.warning(f"API: User {user_id} trying to add like to session {session_id} owned by {session_obj.user_id}")
+        if owner_id != user_id:
+            logger.warning(f"API: User {user_id} trying to add like to session {session_id} owned by {owner_id}")
             return jsonify({'error': 'Session access denied'}), 403
 
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data or 'track_id' not in data:
             logger.warning("API: add_session_like called without track_id")
             return jsonify({'error': 'track_id is required'}), 400
@@ -750,7 +717,7 @@ def add_session_like(user_id, session_id):
             return jsonify({'error': 'Valid track_id is required'}), 400
 
         # Add the track to likes
-        was_added = session_obj.add_liked_track_by_id(track_id)
+        was_added = add_liked_track(session_id, track_id)
 
         if was_added:
             logger.info(f"API: Added track {track_id} to likes for session {session_id}")
@@ -772,19 +739,10 @@ def add_session_like(user_id, session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/user/<int:user_id>/sessions/<int:session_id>/track', methods=['GET'])
+@require_user
 def get_user_session_track(user_id, session_id):
     """Get a random track from the specified user session"""
-    logger.debug(f"API: Getting track for user {user_id} from session {session_id}")
-
-    # Check if user is authenticated and matches the requested user_id
-    current_user_id = session.get('user_id')
-    if not current_user_id:
-        logger.warning("API: Unauthenticated user trying to get track")
-        return jsonify({'error': 'Authentication required'}), 401
-
-    if current_user_id != user_id:
-        logger.warning(f"API: User {current_user_id} trying to get track for user {user_id}")
-        return jsonify({'error': 'Access denied'}), 403
+    logger.debug("API: Getting track for user %s from session %s", user_id, session_id)
 
     try:
         # Load the specific session
@@ -827,7 +785,7 @@ def get_user_session_track(user_id, session_id):
                 )
                 if youtube_video_id:
                     track['youtube_video_id'] = youtube_video_id
-                    logger.debug(f"Added YouTube video ID {youtube_video_id} for track {track['track_id']}")
+                    logger.debug("Added YouTube video ID %s for track %s", youtube_video_id, track['track_id'])
                 else:
                     logger.warning(f"No YouTube video found for track {track['track_id']}")
             except Exception as e:
@@ -842,12 +800,10 @@ def get_user_session_track(user_id, session_id):
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory(app.static_folder, path)
+    max_age = None if path.endswith('.html') else STATIC_MAX_AGE
+    return send_from_directory(app.static_folder, path, max_age=max_age)
 
 if __name__ == '__main__':
-    # Initialize database
-    logger.info("Initializing database...")
-    init_db('music_app.db')
-    
+    # Development server only; run `gunicorn server:app` (see gunicorn.conf.py) in production
     logger.info("Starting Flask server on port 3001")
-    app.run(port=3001, debug=True)
\ No newline at end of file
+    app.run(port=3001)
\ No newline at end of file
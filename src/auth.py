@@ -5,6 +5,7 @@ Handles user registration, login, password hashing, and session management.
 """
 
 import logging
+import re
 from typing import Optional, Dict, Any
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -12,6 +13,9 @@ from utils.db import get_db
 
 logger = logging.getLogger(__name__)
 
+# 3-50 characters, only alphanumeric and common safe characters
+USERNAME_PATTERN = re.compile(r'[A-Za-z0-9_.-]{3,50}')
+
 
 class AuthError(Exception):
     """Custom exception for authentication errors"""
@@ -31,16 +35,7 @@ def validate_username(username: str) -> bool:
     if not username or not isinstance(username, str):
         return False
     
-    username = username.strip()
-    if len(username) < 3 or len(username) > 50:
-        return False
-    
-    # Only allow alphanumeric and common safe characters
-    allowed_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-.')
-    if not all(c in allowed_chars for c in username):
-        return False
-    
-    return True
+    return USERNAME_PATTERN.fullmatch(username.strip()) is not None
 
 
 def validate_password(password: str) -> bool:
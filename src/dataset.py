@@ -1,11 +1,12 @@
+import functools
 import logging
 import numpy as np
 import pandas as pd
 import requests
 import os
-from src.filters import FILTER_REGISTRY, FILTER_RADIUS, create_adjusted_filter, FILTER_RADIUS_TEMPO
+from src.filters import FILTER_REGISTRY, FILTER_RADIUS, FILTER_RADIUS_TEMPO
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=(os.environ.get('LOG_LEVEL') or 'INFO').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 genre_groups = {
@@ -46,34 +47,143 @@ genre_groups = {
     ]
 }
 
+# Columns kept as NumPy arrays for the pool operations
+TRACK_COLUMNS = ['track_id', 'track_name', 'artists', 'track_genre',
+                 'danceability', 'energy', 'speechiness', 'valence', 'tempo',
+                 'acousticness', 'instrumentalness', 'liveness']
+
+# Audio features used for pool averages and track selection
+AUDIO_FEATURES = ['danceability', 'energy', 'speechiness', 'valence', 'tempo', 'acousticness', 'instrumentalness', 'liveness']
+
+# API track dictionary key -> dataset column
+TRACK_FIELDS = [('track_id', 'track_id'), ('track_name', 'track_name'),
+                ('artist_name', 'artists'), ('genre', 'track_genre')] + [(feature, feature) for feature in AUDIO_FEATURES]
+
+# Low-cardinality text columns (~114 genres, ~31k artists over 114k rows) stored as categoricals
+CATEGORICAL_COLUMNS = ['track_genre', 'artists']
+
+DATASET_CSV_PATH = 'data/dataset.csv'
+DATASET_CACHE_PATH = 'data/dataset.pkl'
+
+# Share of newly injected tracks when a filter shrinks the pool (30% old tracks, 70% new tracks)
+DEFAULT_FRESH_INJECTION_RATIO = 0.7
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tracks():
+    """Read the track data once per process; the DataFrame is shared read-only by all Datasets"""
+    # Reuse the binary cache unless the CSV has been updated since it was written
+    if (os.path.exists(DATASET_CACHE_PATH)
+            and os.path.getmtime(DATASET_CACHE_PATH) >= os.path.getmtime(DATASET_CSV_PATH)):
+        try:
+            df = pd.read_pickle(DATASET_CACHE_PATH)
+        except Exception as e:
+            # A truncated or unreadable cache is rebuilt from the CSV like a stale one
+            logger.warning(f"Could not read dataset cache {DATASET_CACHE_PATH}, rebuilding: {e}")
+        else:
+            # A cache written with a different column set or dtypes is stale, rebuild it
+            if (set(df.columns) == set(TRACK_COLUMNS)
+                    and all(df[feature].dtype == np.float32 for feature in AUDIO_FEATURES)
+                    and all(isinstance(df[column].dtype, pd.CategoricalDtype) for column in CATEGORICAL_COLUMNS)):
+                logger.info(f"Loaded dataset with {len(df)} tracks from cache")
+                return df
+            logger.info(f"Dataset cache {DATASET_CACHE_PATH} does not match the expected columns, rebuilding")
+
+    # Only parse the columns the app uses; categoricals store each repeated genre and
+    # artist string once, with small integer codes per row
+    df = pd.read_csv(DATASET_CSV_PATH, usecols=TRACK_COLUMNS,
+                     dtype={column: 'category' for column in CATEGORICAL_COLUMNS})
+    # Every audio feature value round-trips exactly through float32; halving their width
+    # halves the memory traffic of every gather/compare/mean over a pool
+    df = df.astype({feature: np.float32 for feature in AUDIO_FEATURES})
+    logger.info(f"Loaded dataset with {len(df)} tracks")
+
+    # Write to a temporary file and swap it in, so an interrupted write or a concurrent
+    # start never leaves a truncated cache behind
+    tmp_path = f"{DATASET_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, DATASET_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"Could not write dataset cache {DATASET_CACHE_PATH}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def _load_columns():
+    """Struct-of-arrays view of the track table: one ndarray per used column"""
+    df = _load_tracks()
+    return {column: df[column].to_numpy() for column in TRACK_COLUMNS}
+
+
+@functools.lru_cache(maxsize=1)
+def _load_id_index():
+    """Hash index mapping each track_id to the row position of its first occurrence,
+    plus an array giving that first-occurrence row for every row"""
+    # track_id repeats when a track is listed under several genres; return_index gives the first row
+    track_ids, first_rows, inverse = np.unique(_load_columns()['track_id'], return_index=True, return_inverse=True)
+    return dict(zip(track_ids.tolist(), first_rows.tolist())), first_rows[inverse]
+
+
+def _compute_genre_pool(genre_group, genre_codes, code_of_genre):
+    """Read-only row positions of a genre group's tracks and their feature means"""
+    columns = _load_columns()
+    # Lookup table over the category codes: True for genres in the group
+    in_group = np.zeros(len(code_of_genre), dtype=bool)
+    in_group[[code_of_genre[genre] for genre in genre_groups[genre_group] if genre in code_of_genre]] = True
+    genre_pool = np.flatnonzero(in_group[genre_codes])
+    genre_pool.flags.writeable = False
+    genre_pool_means = {feature: columns[feature][genre_pool].mean(dtype=np.float64) if genre_pool.size else np.nan
+                        for feature in AUDIO_FEATURES}
+    return genre_pool, genre_pool_means
+
+
+@functools.lru_cache(maxsize=1)
+def _load_genre_pools():
+    """Genre group -> (pool, means) for every group, built eagerly so preforked workers share them"""
+    genres = _load_tracks()['track_genre'].cat
+    genre_codes = genres.codes.to_numpy()
+    code_of_genre = {genre: code for code, genre in enumerate(genres.categories)}
+    return {genre_group: _compute_genre_pool(genre_group, genre_codes, code_of_genre) for genre_group in genre_groups}
+
+
 class Dataset:
 
     def __init__(self):
         logger.info("Initializing Dataset")
-        self.df = pd.read_csv('data/dataset.csv')
-        logger.info(f"Loaded dataset with {len(self.df)} tracks")
-
-        # Two-pool system
+        self.df = _load_tracks()
+        self.columns = _load_columns()
+        self.genre_pools = _load_genre_pools()
+        self.id_to_row, self.first_row = _load_id_index()
+        # (API key, column array) pairs, resolved once for building track dictionaries
+        self._track_fields = [(key, self.columns[column]) for key, column in TRACK_FIELDS]
+
+        # Two-pool system, each pool is an int64 array of row positions into self.columns
         self.genre_pool = None  # Starting pool from genre selection (immutable)
         self.playback_pool = None  # Active pool for playing tracks (gets rebuilt)
+        self.genre_pool_means = {}  # Per-feature means of the genre pool, computed once per pool
 
         # Filter queue system
         self.filter_queue = []  # List of filter operations in order
 
         # Fresh injection system
-        self.fresh_injection_ratio = 0.7  # 30% old tracks, 70% new tracks (default)
+        self.fresh_injection_ratio = DEFAULT_FRESH_INJECTION_RATIO
         self.pool_size_multiplier = 2.0  # Target size = filter_result_size * multiplier
         self.radius_multiplier_factor = 0.5  # How much to scale radius when reduction > 50%
         
         # Cross-genre expansion system
         self.minimum_pool_threshold = 50  # Minimum tracks required before cross-genre expansion
         self.cross_genre_expansion_ratio = 0.3  # How much of expansion should be cross-genre
+        self.cross_genre_expanded = False  # Whether the last rebuild sampled cross-genre tracks
         
         # Audio features for calculations
-        self.audio_features = ['danceability', 'energy', 'speechiness', 'valence', 'tempo', 'acousticness', 'instrumentalness', 'liveness']
+        self.audio_features = AUDIO_FEATURES
         self.controlled_features = []
 
         self.shown_tracks = set()  # Store tracks that have been shown to avoid repetition
+        self.rng = np.random.default_rng()  # Per-instance generator for all track sampling
 
     def set_genre_pool(self, genre_group):
         """Set the genre pool from the selected genre group and reset system"""
@@ -85,18 +195,14 @@ class Dataset:
         # Get all genres in the selected group
         group_genres = genre_groups[genre_group]
 
-        # Set genre pool (immutable starting point)
-        self.genre_pool = self.df[self.df['track_genre'].isin(group_genres)].copy()
+        # Set genre pool (immutable starting point, shared by every Dataset using this group)
+        self.genre_pool, self.genre_pool_means = self.genre_pools[genre_group]
 
         # Reset filter queue
         self.filter_queue = []
 
-        # Initialize playback pool as copy of genre pool
-        self.playback_pool = self.genre_pool.copy()
-
-        # Legacy compatibility
-        self.current_pool = self.playback_pool.copy()
-        self.original_pool = self.genre_pool.copy()
+        # Pools are never modified in place, so the playback pool can share the genre pool array
+        self.playback_pool = self.genre_pool
 
         pool_size = len(self.genre_pool)
         logger.info(f"Genre pool set with {pool_size} tracks from genres: {group_genres}")
@@ -109,6 +215,7 @@ class Dataset:
             return
 
         self.filter_queue = self._remove_contradicting_filter(self.filter_queue, )
+        self.cross_genre_expanded = False
 
         # Rebuild playback pool by applying all filters in sequence
         pool_size_before = len(self.playback_pool) if self.playback_pool is not None else 0
@@ -124,63 +231,80 @@ class Dataset:
         if pool_size < self.minimum_pool_threshold:
             logger.warning(f"Playback pool size below minimum threshold: {pool_size} < {self.minimum_pool_threshold}")
 
+    def apply_filter_state(self, genre_group, filter_queue):
+        """
+        Set the genre pool and the playback pool produced by a filter queue.
+
+        Pools are memoized per (genre_group, filter_queue) state, so repeated requests
+        against an unchanged session reuse the pool instead of re-running every filter.
+        Pools topped up by cross-genre expansion are randomly sampled, so those are
+        rebuilt with this instance's generator instead of being shared.
+
+        Args:
+            genre_group: Genre group name
+            filter_queue: Filter names in the order they were applied
+
+        Returns:
+            True if the genre pool was set, False otherwise
+        """
+        if not self.set_genre_pool(genre_group):
+            return False
+
+        if filter_queue:
+            playback_pool, applied_queue = _compute_playback_pool(genre_group, tuple(filter_queue))
+            if playback_pool is None:
+                self.filter_queue = list(filter_queue)
+                self.rebuild_playback_pool()
+            else:
+                self.playback_pool = playback_pool
+                self.filter_queue = list(applied_queue)
+
+        return True
+
     def get_random_track(self, shown_tracks):
         """Get a track from the current pool using configured selection strategy"""
         # Use playback pool if it has tracks, otherwise use genre pool
-        pool_to_use = self.playback_pool if self.playback_pool is not None and not self.playback_pool.empty else self.genre_pool
+        pool_to_use = self.playback_pool if self.playback_pool is not None and self.playback_pool.size > 0 else self.genre_pool
 
-        if pool_to_use is None or pool_to_use.empty:
+        if pool_to_use is None or pool_to_use.size == 0:
             logger.warning("Attempted to get track from empty pool")
             return None
 
         # For pure random, also exclude shown tracks
-        unshown_pool = pool_to_use[~pool_to_use['track_id'].isin(shown_tracks)]
-        track = self._get_average_centered_track(unshown_pool)
+        unshown_pool = self._exclude_shown(pool_to_use, shown_tracks)
+        row = self._get_average_centered_track(unshown_pool)
 
-        if track is None:
+        if row is None:
             return None
 
-        # Record that this track has been shown
-        track_id = track['track_id']
+        track = self._track_at(row)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Selected track: %s by %s (shown: %d total)",
+                         track['track_name'], track['artist_name'], len(self.shown_tracks))
+        return track
 
-        logger.debug(
-            f"Selected track: {track['track_name']} by {track['artists']} (shown: {len(self.shown_tracks)} total)")
-        return {
-            'track_id': track_id,
-            'track_name': track['track_name'],
-            'artist_name': track['artists'],
-            'genre': track['track_genre'],
-            'danceability': track['danceability'],
-            'energy': track['energy'],
-            'speechiness': track['speechiness'],
-            'valence': track['valence'],
-            'tempo': track['tempo'],
-            'acousticness': track['acousticness'],
-            'instrumentalness': track['instrumentalness'],
-            'liveness': track['liveness']
-        }
+    def _exclude_shown(self, pool, track_ids):
+        """Drop rows whose track_id is in track_ids, including the same track listed under other genres"""
+        if not track_ids:
+            return pool
+
+        # Mark shown tracks by their first-occurrence row, then test every pool row through first_row
+        shown_rows = np.zeros(self.first_row.size, dtype=bool)
+        shown_rows[[self.id_to_row[track_id] for track_id in track_ids if track_id in self.id_to_row]] = True
+        return pool[~shown_rows[self.first_row[pool]]]
 
     def get_track_by_id(self, track_id):
         """Get track details by ID"""
-        track = self.df[self.df['track_id'] == track_id]
-        if track.empty:
+        row = self.id_to_row.get(track_id)
+        if row is None:
             return None
 
-        track = track.iloc[0]
-        return {
-            'track_id': track['track_id'],
-            'track_name': track['track_name'],
-            'artist_name': track['artists'],
-            'genre': track['track_genre'],
-            'danceability': track['danceability'],
-            'energy': track['energy'],
-            'speechiness': track['speechiness'],
-            'valence': track['valence'],
-            'tempo': track['tempo'],
-            'acousticness': track['acousticness'],
-            'instrumentalness': track['instrumentalness'],
-            'liveness': track['liveness']
-        }
+        return self._track_at(row)
+
+    def _track_at(self, row):
+        """Build the API track dictionary for a row position"""
+        # Values stay NumPy scalars; the orjson provider encodes them natively
+        return {key: values[row] for key, values in self._track_fields}
 
     def get_youtube_video_id(self, track_name, artist_name):
         """
@@ -214,7 +338,7 @@ class Dataset:
                 'key': youtube_api_key,
             }
 
-            logger.debug(f"YouTube API search for: '{search_query}'")
+            logger.debug("YouTube API search for: '%s'", search_query)
 
             # Make API request with timeout
             response = requests.get(url="https://www.googleapis.com/youtube/v3/search", timeout=5,
@@ -243,7 +367,7 @@ class Dataset:
 
     def get_pool_stats(self):
         """Get statistics about the current track pools"""
-        if self.playback_pool is None or self.playback_pool.empty:
+        if self.playback_pool is None or self.playback_pool.size == 0:
             return {
                 'total_tracks': len(self.df) if self.df is not None else 0,
                 'genre_pool_size': len(self.genre_pool) if self.genre_pool is not None else 0,
@@ -270,36 +394,41 @@ class Dataset:
         }
 
     def _get_average_centered_track(self, pool):
-        """Select a track within FILTER_CONFIG radius of pool averages, excluding shown tracks"""
-        if pool.empty:
+        """Select a row within FILTER_CONFIG radius of pool averages, excluding shown tracks"""
+        if pool.size == 0:
             return None
 
         # First, exclude tracks that have already been shown
-        unshown_pool = pool[~pool['track_id'].isin(self.shown_tracks)]
+        unshown_pool = self._exclude_shown(pool, self.shown_tracks)
 
         # If all tracks have been shown, reset shown tracks and use full pool
-        if unshown_pool.empty:
+        if unshown_pool.size == 0:
             logger.info(f"All {len(pool)} tracks have been shown, resetting shown tracks history")
             self.shown_tracks.clear()
-            unshown_pool = pool.copy()
+            unshown_pool = pool
+
+        logger.debug("Track selection pool: %s unshown tracks (out of %s total)", len(unshown_pool), len(pool))
 
-        logger.debug(f"Track selection pool: {len(unshown_pool)} unshown tracks (out of {len(pool)} total)")
+        # Gather each feature once; the averages, radius check and fallback distances all reuse it
+        pool_values = {feature: self.columns[feature][unshown_pool] for feature in self.audio_features}
 
         # Calculate pool averages
         pool_averages = {}
         for feature in self.audio_features:
-            pool_averages[feature] = unshown_pool[feature].mean()
+            pool_averages[feature] = pool_values[feature].mean(dtype=np.float64)
 
         # Filter tracks that are within radius of averages (same logic as filters use)
         radius = FILTER_RADIUS  # 0.1
         tempo_radius_factor = FILTER_RADIUS_TEMPO # 0.15
 
-        candidates = unshown_pool.copy()
+        within_radius = np.ones(unshown_pool.size, dtype=bool)
+        log_debug = logger.isEnabledFor(logging.DEBUG)
 
         # Apply radius constraints for each feature
         for feature in self.audio_features:
             avg_value = pool_averages[feature]
-            logger.debug(f"Average {feature} value: {avg_value:.3f}")
+            if log_debug:
+                logger.debug(f"Average {feature} value: {avg_value:.3f}")
             if feature == 'tempo':
                 # Use percentage-based radius for tempo (same as filters)
                 tempo_radius = avg_value * tempo_radius_factor
@@ -310,42 +439,38 @@ class Dataset:
                 min_val = avg_value - radius
                 max_val = avg_value + radius
 
-            # Filter candidates to stay within radius
-            candidates = candidates[
-                (candidates[feature] >= min_val) &
-                (candidates[feature] <= max_val)
-                ]
+            # Keep candidates that stay within radius
+            values = pool_values[feature]
+            within_radius &= (values >= min_val) & (values <= max_val)
 
+        candidates = unshown_pool[within_radius]
 
         # If no tracks within radius, fall back to closest unshown tracks
-        if candidates.empty:
+        if candidates.size == 0:
             logger.debug("No unshown tracks within radius, selecting closest to averages")
-            distances = []
-            for idx, track in unshown_pool.iterrows():
-                distance = 0
-                for feature in self.audio_features:
-                    if feature == 'tempo':
-                        # Normalize tempo for distance calculation
-                        track_norm = (track[feature] - 60) / (200 - 60)
-                        avg_norm = (pool_averages[feature] - 60) / (200 - 60)
-                        distance += (track_norm - avg_norm) ** 2
-                    else:
-                        distance += (track[feature] - pool_averages[feature]) ** 2
-                distances.append((idx, np.sqrt(distance)))
+            squared_distance = np.zeros(unshown_pool.size)
+            for feature in self.audio_features:
+                values = pool_values[feature]
+                if feature == 'tempo':
+                    # Normalize tempo for distance calculation
+                    track_norm = (values - 60) / (200 - 60)
+                    avg_norm = (pool_averages[feature] - 60) / (200 - 60)
+                    squared_distance += (track_norm - avg_norm) ** 2
+                else:
+                    squared_distance += (values - pool_averages[feature]) ** 2
+            distances = np.sqrt(squared_distance)
 
             # Select from closest 10% of unshown tracks as fallback
-            distances.sort(key=lambda x: x[1])
+            order = np.argsort(distances, kind='stable')
             fallback_size = max(1, len(distances) // 10)
-            candidate_indices = [idx for idx, dist in distances[:fallback_size]]
-            selected_idx = np.random.choice(candidate_indices)
-            track = unshown_pool.loc[selected_idx]
-            logger.debug(f"Fallback selection: closest unshown track distance {distances[0][1]:.3f}")
+            row = unshown_pool[order[self.rng.integers(fallback_size)]]
+            logger.debug("Fallback selection: closest unshown track distance %.3f", distances[order[0]])
         else:
             # Random selection from unshown tracks within radius
-            track = candidates.sample(n=1).iloc[0]
-            logger.debug(f"Radius-constrained selection: {len(candidates)} unshown candidates within radius")
+            row = candidates[self.rng.integers(candidates.size)]
+            logger.debug("Radius-constrained selection: %s unshown candidates within radius", len(candidates))
 
-        return track
+        return row
 
     def _calculate_reduction_rate(self, pool_before, pool_after):
         """Calculate the reduction rate from filter application"""
@@ -361,16 +486,16 @@ class Dataset:
 
         if len(self.filter_queue) == 0:
             # No filters: playback pool = genre pool
-            self.playback_pool = self.genre_pool.copy()
+            self.playback_pool = self.genre_pool
             logger.info(f"No filters. Playback pool set to genre pool: {len(self.playback_pool)} tracks")
             return
 
         # Start with genre pool for the first filter
-        current_pool = self.genre_pool.copy()
+        current_pool = self.genre_pool
 
         controlled_features = []
-        logger.debug(
-            f"Applying features with {radius_multiplier}x radius multiplier")
+        progressive_counts = {}
+        logger.debug("Applying features with %sx radius multiplier", radius_multiplier)
         # Apply each filter one-by-one with mixing after each
         for i, filter_record in enumerate(self.filter_queue):
             filter_func = FILTER_REGISTRY.get(filter_record)
@@ -381,55 +506,47 @@ class Dataset:
                 logger.error(f"Filter function not found: {filter_record}")
                 continue
 
-            # For progressive filters, count how many times this filter has been applied before
-            application_count = 0
-            if filter_record.startswith('filter_progressive_'):
-                # Count previous applications of the same progressive filter
-                for prev_filter in self.filter_queue[:i]:
-                    if prev_filter == filter_record:
-                        application_count += 1
-            
-            # Test filter to calculate reduction rate
-            pool_before = len(current_pool)
             if filter_record.startswith('filter_progressive_'):
-                test_result = filter_func(current_pool.copy(), application_count)
+                # Progressive filters don't use the radius multiplier system; they step up their
+                # threshold with the number of earlier applications of the same filter
+                application_count = progressive_counts.get(filter_record, 0)
+                progressive_counts[filter_record] = application_count + 1
+                filtered_result = filter_func(current_pool, self.columns, application_count)
             else:
-                test_result = filter_func(current_pool.copy())
-            pool_after = len(test_result)
-            reduction_rate = self._calculate_reduction_rate(pool_before, pool_after)
+                filter_kwargs = {'radius_multiplier': radius_multiplier}
+                # The first filter runs on the untouched genre pool, so reuse its cached mean
+                if i == 0:
+                    filter_kwargs['pool_mean'] = self.genre_pool_means[filter_feature]
+                filtered_result = filter_func(current_pool, self.columns, **filter_kwargs)
 
-            if filter_record.startswith('filter_progressive_'):
-                # Progressive filters don't use the radius multiplier system
-                filtered_result = filter_func(current_pool.copy(), application_count)
-            else:
-                adjusted_filter = create_adjusted_filter(filter_func, radius_multiplier)
-                filtered_result = adjusted_filter(current_pool.copy())
+            reduction_rate = self._calculate_reduction_rate(len(current_pool), len(filtered_result))
+            logger.debug("Filter %d reduction rate: %.1f%%", i + 1, reduction_rate * 100)
 
-            if filtered_result.empty:
+            if filtered_result.size == 0:
                 logger.warning(f"Pool became empty after filter {i + 1}: {filter_record}, skipping remaining filters")
                 break
 
             self.playback_pool = filtered_result
 
             # Update current_pool for next iteration
-            current_pool = self.playback_pool.copy()
+            current_pool = self.playback_pool
 
             logger.info(f"Filter {i + 1} complete: {filter_record} -> mixed pool has {len(self.playback_pool)} tracks")
 
         # Check if we need cross-genre expansion after all filters
         if self.playback_pool is not None and len(self.playback_pool) < self.minimum_pool_threshold:
-            logger.debug(f"Pool requires cross-genre expansion: {len(self.playback_pool)}")
+            logger.debug("Pool requires cross-genre expansion: %s", len(self.playback_pool))
             self._expand_with_cross_genre(controlled_features)
 
         # Ensure we have a valid playback pool
-        if self.playback_pool is None or self.playback_pool.empty:
+        if self.playback_pool is None or self.playback_pool.size == 0:
             logger.warning("Playback pool is empty after all filters, falling back to genre pool")
-            self.playback_pool = self.genre_pool.copy()
+            self.playback_pool = self.genre_pool
 
     def _expand_with_cross_genre(self, controlled_features):
         """Expand current pool using dataset averages within filter radius from total pool"""
         dataset_averages = self._get_pool_averages(self.playback_pool)
-        logger.debug(f"Dataset averages before cross expansion: {dataset_averages}")
+        logger.debug("Dataset averages before cross expansion: %s", dataset_averages)
 
         needed_tracks = self.minimum_pool_threshold - len(self.playback_pool)
         
@@ -442,23 +559,25 @@ class Dataset:
         dataset_averages = {feature: dataset_averages[feature] for feature in controlled_features}
 
         # Select tracks from entire dataset within radius of dataset averages
-        selected_tracks = self._select_tracks_near_averages(self.df, needed_tracks, dataset_averages)
+        selected_tracks = self._select_tracks_near_averages(np.arange(len(self.df)), needed_tracks, dataset_averages)
 
-        logger.debug(f"Selected averages: {self._get_pool_averages(selected_tracks)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Selected averages: {self._get_pool_averages(selected_tracks)}")
 
-        if not selected_tracks.empty:
+        if selected_tracks.size > 0:
             # Add selected tracks to playback pool
-            self.playback_pool = pd.concat([self.playback_pool, selected_tracks], ignore_index=True)
+            self.playback_pool = np.concatenate([self.playback_pool, selected_tracks])
             # Shuffle to mix new tracks with existing tracks
-            self.playback_pool = self.playback_pool.sample(frac=1.0).reset_index(drop=True)
+            self.playback_pool = self.rng.permutation(self.playback_pool)
+            self.cross_genre_expanded = True
             
             logger.info(f"Cross-genre expansion complete: added {len(selected_tracks)} tracks near dataset averages (final size: {len(self.playback_pool)})")
         else:
             logger.warning("No tracks found within radius of dataset averages")
     
     def _select_tracks_near_averages(self, pool, needed_count, target_averages):
-        """Select tracks within filter radius of target averages"""
-        candidates = pool.copy()
+        """Select rows within filter radius of target averages"""
+        candidates = pool
         
         # Apply radius constraints for each feature (same logic as average-centered selection)
         for feature in self.audio_features:
@@ -478,35 +597,33 @@ class Dataset:
                 max_val = avg_value + FILTER_RADIUS
             
             # Filter candidates to stay within radius
-            candidates = candidates[
-                (candidates[feature] >= min_val) &
-                (candidates[feature] <= max_val)
-            ]
+            values = self.columns[feature][candidates]
+            candidates = candidates[(values >= min_val) & (values <= max_val)]
 
         
         # Random sample from candidates within radius
-        if not candidates.empty:
+        if candidates.size > 0:
             sample_size = min(needed_count, len(candidates))
-            selected_tracks = candidates.sample(n=sample_size)
-            logger.debug(f"Selected {len(selected_tracks)} tracks within radius of dataset averages")
+            selected_tracks = self.rng.choice(candidates, size=sample_size, replace=False)
+            logger.debug("Selected %s tracks within radius of dataset averages", len(selected_tracks))
             return selected_tracks
         else:
-            logger.warning("No tracks found within radius, returning empty DataFrame")
-            return pd.DataFrame()
+            logger.warning("No tracks found within radius, returning empty pool")
+            return np.empty(0, dtype=np.int64)
 
     def _get_pool_averages(self, pool=None):
         """Get average audio features for the specified pool (defaults to current playback pool)"""
         target_pool = pool if pool is not None else self.playback_pool
         
-        if target_pool is None or target_pool.empty:
+        if target_pool is None or target_pool.size == 0:
             return {}
 
         averages = {}
         for feature in self.audio_features:
             if feature == 'tempo':
-                averages[feature] = round(target_pool[feature].mean(), 1)
+                averages[feature] = round(self.columns[feature][target_pool].mean(dtype=np.float64), 1)
             else:
-                averages[feature] = round(target_pool[feature].mean(), 3)
+                averages[feature] = round(self.columns[feature][target_pool].mean(dtype=np.float64), 3)
 
         return averages
 
@@ -534,3 +651,21 @@ class Dataset:
                 to_remove.add(opposites[f])
 
         return list(filters - to_remove)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_playback_pool(genre_group, filter_queue):
+    """
+    Build the playback pool for a filter state; the returned pool is read-only and shared.
+
+    The pool is None when cross-genre expansion sampled tracks into it: a random sample
+    must not be frozen into the cache, so callers rebuild that state themselves.
+    """
+    dataset = Dataset()
+    dataset.set_genre_pool(genre_group)
+    dataset.filter_queue = list(filter_queue)
+    dataset.rebuild_playback_pool()
+    if dataset.cross_genre_expanded:
+        return None, tuple(dataset.filter_queue)
+    dataset.playback_pool.flags.writeable = False
+    return dataset.playback_pool, tuple(dataset.filter_queue)
@@ -8,7 +8,7 @@ of liked tracks and session state through the database.
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from src.dataset import Dataset
+from src.dataset import Dataset, DEFAULT_FRESH_INJECTION_RATIO
 from utils.db import get_db
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,7 @@ class Session:
         self.session_id = session_id
         self.name = name
         self.user_id = user_id
+        self.genre_group = None
         self.dataset = Dataset()
         self.db = get_db()
 
@@ -84,26 +85,7 @@ class Session:
         Returns:
             True if track was added (new), False if already existed or error
         """
-        try:
-            # Insert liked track (will be ignored if already exists due to UNIQUE constraint)
-            cursor = self.db.execute(
-                "INSERT OR IGNORE INTO session_liked_tracks (session_id, track_id) VALUES (?, ?)",
-                (self.session_id, track_id)
-            )
-
-            # Check if the insert actually added a row (rowcount > 0 means new like)
-            was_added = cursor.rowcount > 0
-
-            if was_added:
-                logger.info(f"Track {track_id} added to likes for session {self.session_id}")
-            else:
-                logger.debug(f"Track {track_id} already liked in session {self.session_id}")
-
-            return was_added
-
-        except Exception as e:
-            logger.error(f"Error adding liked track {track_id} for session {self.session_id}: {e}")
-            return False
+        return add_liked_track(self.session_id, track_id)
     
     def get_liked_track_ids(self) -> List[str]:
         """
@@ -112,30 +94,7 @@ class Session:
         Returns:
             List of track IDs for liked tracks
         """
-        try:
-            rows = self.db.fetch_all(
-                "SELECT track_id FROM session_liked_tracks WHERE session_id = ? ORDER BY liked_at",
-                (self.session_id,)
-            )
-
-            track_ids = []
-            for row in rows:
-                try:
-                    track_id = row['track_id']
-                    if track_id and isinstance(track_id, str):
-                        track_ids.append(track_id)
-                    else:
-                        logger.warning(f"Invalid track_id {track_id} for session {self.session_id}, skipping")
-
-                except Exception as e:
-                    logger.warning(f"Error processing track_id for session {self.session_id}: {e}, skipping")
-                    continue
-
-            return track_ids
-
-        except Exception as e:
-            logger.error(f"Error fetching liked tracks for session {self.session_id}: {e}")
-            return []
+        return get_liked_track_ids(self.session_id)
     
     def get_liked_track_details(self) -> List[Dict[str, Any]]:
         """
@@ -150,14 +109,13 @@ class Session:
         for track_id in liked_track_ids:
             try:
                 # Find track in dataset by track_id
-                track_matches = self.dataset.df[self.dataset.df['track_id'] == track_id]
-                if not track_matches.empty:
-                    track = track_matches.iloc[0]
+                track = self.dataset.get_track_by_id(track_id)
+                if track is not None:
                     tracks.append({
                         'track_id': track['track_id'],
                         'track_name': track['track_name'],
-                        'artist_name': track['artists'],
-                        'genre': track['track_genre']
+                        'artist_name': track['artist_name'],
+                        'genre': track['genre']
                     })
                 else:
                     logger.warning(f"Liked track {track_id} not found in current dataset for session {self.session_id}")
@@ -190,11 +148,11 @@ class Session:
             self.db.execute(
                 """INSERT OR REPLACE INTO session_state
                    (session_id, current_genre)
-                   VALUES (?, ?, ?)""",
+                   VALUES (?, ?)""",
                 (self.session_id, current_genre)
             )
             
-            logger.debug(f"State saved for session {self.session_id}")
+            logger.debug("State saved for session %s", self.session_id)
             return True
             
         except Exception as e:
@@ -213,9 +171,10 @@ class Session:
             if session_row:
                 self.name = session_row['name']
                 self.user_id = session_row['user_id']
-                self.dataset.set_genre_pool(session_row['genre_group'])
+                self.genre_group = session_row['genre_group']
+                self.dataset.set_genre_pool(self.genre_group)
 
-            logger.debug(f"State loaded for session {self.session_id}")
+            logger.debug("State loaded for session %s", self.session_id)
             
         except Exception as e:
             logger.error(f"Error loading state for session {self.session_id}: {e}")
@@ -236,6 +195,7 @@ class Session:
             
             if genre_group is not None:
                 update_data['genre_group'] = genre_group
+                self.genre_group = genre_group
             
             if last_track_id is not None:
                 update_data['last_track_id'] = last_track_id
@@ -247,7 +207,7 @@ class Session:
                 (self.session_id,)
             )
             
-            logger.debug(f"Session metadata updated for session {self.session_id}")
+            logger.debug("Session metadata updated for session %s", self.session_id)
             return True
             
         except Exception as e:
@@ -345,31 +305,21 @@ class Session:
     def get_dataset(self) -> 'Dataset':
         """
         Get the dataset for this session with all filters applied.
-        This reconstructs the dataset state from the filters table each time.
+        This reconstructs the dataset state from the filters table each time;
+        the genre comes from the session row already read by _load_state().
 
         Returns:
             Dataset instance with filters applied
         """
         try:
-            # Load session info to get the genre
-            session_row = self.db.fetch_one(
-                "SELECT genre_group FROM sessions WHERE id = ?",
-                (self.session_id,)
-            )
+            if self.genre_group:
+                # Get all filters for this session in chronological order
+                filter_queue = [filter['filter_type'] for filter in self.get_filters()]
 
-            if session_row and session_row['genre_group']:
-                # Set genre pool
-                if not self.dataset.set_genre_pool(session_row['genre_group']):
+                # Set genre pool and the playback pool for the current filters
+                if not self.dataset.apply_filter_state(self.genre_group, filter_queue):
                     logger.error(f"Failed to set genre pool for session {self.session_id}")
                     return self.dataset
-
-                # Get all filters for this session in chronological order
-                filters = self.get_filters()
-
-                # If filters are not up-to-date, rebuild playback pool
-                if self.dataset.filter_queue != filters:
-                    self.dataset.filter_queue = [filter['filter_type'] for filter in filters]
-                    self.dataset.rebuild_playback_pool()
             else:
                 logger.warning(f"No genre set for session {self.session_id}")
 
@@ -378,7 +328,6 @@ class Session:
         except Exception as e:
             logger.error(f"Error reconstructing dataset for session {self.session_id}: {e}")
             # Return a basic dataset as fallback
-            from src.dataset import Dataset
             return Dataset()
 
     def add_shown_track(self, dataset_id: str) -> None:
@@ -413,6 +362,89 @@ class Session:
             logger.error(f"Error retrieving shown tracks for session {self.session_id}: {e}")
             return []
 
+def get_session_owner(session_id: int) -> Optional[int]:
+    """
+    Get the user_id owning a session without loading the session.
+
+    Args:
+        session_id: ID of the session
+
+    Returns:
+        Owner's user ID, or None if the session does not exist or is anonymous
+    """
+    row = get_db().fetch_one("SELECT user_id FROM sessions WHERE id = ?", (session_id,))
+    return row['user_id'] if row else None
+
+
+def add_liked_track(session_id: int, track_id: str) -> bool:
+    """
+    Add a track to a session's liked tracks without loading the session.
+
+    Args:
+        session_id: ID of the session
+        track_id: Spotify track ID
+
+    Returns:
+        True if track was added (new), False if already existed or error
+    """
+    try:
+        # Insert liked track (will be ignored if already exists due to UNIQUE constraint)
+        cursor = get_db().execute(
+            "INSERT OR IGNORE INTO session_liked_tracks (session_id, track_id) VALUES (?, ?)",
+            (session_id, track_id)
+        )
+
+        # Check if the insert actually added a row (rowcount > 0 means new like)
+        was_added = cursor.rowcount > 0
+
+        if was_added:
+            logger.info(f"Track {track_id} added to likes for session {session_id}")
+        else:
+            logger.debug("Track %s already liked in session %s", track_id, session_id)
+
+        return was_added
+
+    except Exception as e:
+        logger.error(f"Error adding liked track {track_id} for session {session_id}: {e}")
+        return False
+
+
+def get_liked_track_ids(session_id: int) -> List[str]:
+    """
+    Get a session's liked track IDs without loading the session.
+
+    Args:
+        session_id: ID of the session
+
+    Returns:
+        List of track IDs for liked tracks
+    """
+    try:
+        rows = get_db().fetch_all(
+            "SELECT track_id FROM session_liked_tracks WHERE session_id = ? ORDER BY liked_at, id",
+            (session_id,)
+        )
+
+        track_ids = []
+        for row in rows:
+            try:
+                track_id = row['track_id']
+                if track_id and isinstance(track_id, str):
+                    track_ids.append(track_id)
+                else:
+                    logger.warning(f"Invalid track_id {track_id} for session {session_id}, skipping")
+
+            except Exception as e:
+                logger.warning(f"Error processing track_id for session {session_id}: {e}, skipping")
+                continue
+
+        return track_ids
+
+    except Exception as e:
+        logger.error(f"Error fetching liked tracks for session {session_id}: {e}")
+        return []
+
+
 def get_all_sessions(user_id: int = None) -> List[Dict[str, Any]]:
     """
     Get list of sessions from database.
@@ -455,6 +487,53 @@ def get_all_sessions(user_id: int = None) -> List[Dict[str, Any]]:
         logger.error(f"Error fetching sessions for user {user_id}: {e}")
         return []
 
+def get_all_sessions_with_info(user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get a user's sessions with the details returned by Session.get_session_info().
+
+    Fetches every session together with its liked track and filter counts in a
+    single query, instead of constructing a Session per row.
+
+    Args:
+        user_id: Only return sessions for this user
+
+    Returns:
+        List of session info dictionaries, most recently updated first
+    """
+    try:
+        db = get_db()
+        rows = db.fetch_all(
+            """
+            SELECT s.id, s.name, s.user_id, s.genre_group, s.last_track_id, s.created_at, s.updated_at,
+                   (SELECT COUNT(*) FROM session_liked_tracks l
+                    WHERE l.session_id = s.id AND l.track_id != '') AS liked_tracks_count,
+                   (SELECT COUNT(*) FROM session_filters f WHERE f.session_id = s.id) AS filter_count
+            FROM sessions s
+            WHERE s.user_id = ?
+            ORDER BY s.updated_at DESC
+            """,
+            (user_id,)
+        )
+
+        return [{
+            'id': row['id'],
+            'name': row['name'],
+            'user_id': row['user_id'],
+            'genre_group': row['genre_group'],
+            'last_track_id': row['last_track_id'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'liked_tracks_count': row['liked_tracks_count'],
+            'pool_size': 0,  # Will be calculated dynamically when needed
+            'adjustment_count': row['filter_count'],
+            'current_genre': None,
+            'fresh_injection_ratio': DEFAULT_FRESH_INJECTION_RATIO
+        } for row in rows]
+
+    except Exception as e:
+        logger.error(f"Error fetching session details for user {user_id}: {e}")
+        return []
+
 def delete_session(session_id: int) -> bool:
     """
     Delete a session and all its associated data.
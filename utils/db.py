@@ -37,6 +37,10 @@ class DatabaseManager:
                 isolation_level=None  # Autocommit mode
             )
             self._local.connection.row_factory = sqlite3.Row
+            # WAL lets readers in other threads and worker processes proceed while one connection
+            # writes; with it, NORMAL sync only fsyncs at checkpoints instead of on every commit
+            self._local.connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection.execute('PRAGMA synchronous=NORMAL')
             
         return self._local.connection
     
@@ -52,7 +56,8 @@ class DatabaseManager:
             # Create the database file and tables
             conn = self._get_connection()
             self._create_tables(conn)
-            conn.close()
+            # Drop the thread-local handle too, so this thread (or a forked worker) reconnects
+            self.close_connection()
             
             logger.info(f"Database initialized at {self.db_path}")
             self._initialized = True
@@ -165,6 +170,13 @@ class DatabaseManager:
                 PRIMARY KEY (dataset_id, session_id)
             ) WITHOUT ROWID;''')
 
+        # Indexes for the per-session and per-user lookups; session_liked_tracks is already
+        # covered by its UNIQUE(session_id, track_id) index, and the shown tracks primary key
+        # leads with dataset_id, so it cannot serve lookups by session
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_updated ON sessions (user_id, updated_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_session_filters_session ON session_filters (session_id, applied_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_session_shown_tracks_session ON session_shown_tracks (session_id)')
+
 
         conn.commit()
         logger.info("Database tables created successfully")
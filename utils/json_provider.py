@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON provider for Flask.
+
+Serializes responses with orjson instead of the stdlib json module. NumPy scalars
+and arrays are encoded natively, so track dictionaries built from the dataset
+columns can be passed to jsonify without converting each value first.
+"""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: Ignored; orjson does not take json.dumps arguments
+
+        Returns:
+            JSON string
+        """
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s: JSON text or bytes
+            **kwargs: Ignored; orjson does not take json.loads arguments
+
+        Returns:
+            Deserialized data
+        """
+        return orjson.loads(s)